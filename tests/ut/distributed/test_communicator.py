@@ -28,15 +28,15 @@ class TestNPUCommunicator(unittest.TestCase):
     @patch("torch.distributed.get_process_group_ranks", return_value=[0, 1])
     @patch("torch.npu.device")
     def test_all_to_all_with_sizes(self, *_):
+        # Explicit splits with gather dim 0: the collective writes straight
+        # into dim-0 views of one preallocated output tensor.
 
         def patched_all_to_all(output_tensor_list,
                                input_tensor_list,
                                group=None,
                                async_op=False):
-            output_tensor_list[:] = ([
-                torch.tensor([10, 20]),
-                torch.tensor([50, 60])
-            ])
+            output_tensor_list[0].copy_(torch.tensor([10, 20]))
+            output_tensor_list[1].copy_(torch.tensor([50, 60]))
 
         torch.distributed.all_to_all = patched_all_to_all
 
@@ -70,19 +70,64 @@ class TestNPUCommunicator(unittest.TestCase):
     @patch("torch.distributed.get_world_size", return_value=2)
     @patch("torch.distributed.get_process_group_ranks", return_value=[0, 1])
     @patch("torch.npu.device")
-    def test_all_to_all_without_sizes(self, *_):
+    def test_all_to_all_with_sizes_gather_last_dim(self, *_):
+        # Non-zero gather dim keeps the per-rank buffer list and cat.
 
         def patched_all_to_all(output_tensor_list,
                                input_tensor_list,
                                group=None,
                                async_op=False):
-            output_tensor_list[:] = ([
-                torch.tensor([[10, 20]]),
-                torch.tensor([[50, 60]])
-            ])
+            output_tensor_list[0].copy_(torch.tensor([[1, 2, 3]]))
+            output_tensor_list[1].copy_(torch.tensor([[4]]))
 
         torch.distributed.all_to_all = patched_all_to_all
 
+        scatter_sizes = [1, 1]
+        gather_sizes = [3, 1]
+        input_ = torch.tensor([[10, 20], [30, 40]])
+
+        with patch.dict(dist.distributed_c10d._world.pg_map, {dist.group.WORLD: MagicMock()}, clear=False):
+            comm = NPUCommunicator(cpu_group=dist.group.WORLD)
+
+        output = comm.all_to_all(input_,
+                                 scatter_dim=0,
+                                 gather_dim=1,
+                                 scatter_sizes=scatter_sizes,
+                                 gather_sizes=gather_sizes)
+
+        assert output.tolist() == [[1, 2, 3, 4]]
+
+    @patch("vllm.config.get_current_vllm_config", return_value=None)
+    @patch("torch.npu.current_device", return_value=MagicMock())
+    @patch("torch.npu.set_device", return_value=MagicMock())
+    @patch("torch.distributed.get_process_group_ranks",
+           return_value={
+               0: 0,
+               1: 1
+           })
+    @patch("torch.distributed.get_group_rank", return_value={0: 0, 1: 1})
+    @patch("torch.distributed.is_initialized", return_value=True)
+    @patch("torch.distributed.get_rank", return_value=1)
+    @patch("torch.distributed.is_initialized", return_value=True)
+    @patch("torch.distributed.get_backend", return_value="hccl")
+    @patch("torch.distributed.get_rank", return_value=1)
+    @patch("torch.distributed.get_world_size", return_value=2)
+    @patch("torch.distributed.get_process_group_ranks", return_value=[0, 1])
+    @patch("torch.npu.device")
+    def test_all_to_all_without_sizes(self, *_):
+        # Equal splits on dim 0 take the all_to_all_single fast path, which
+        # receives the rank-stacked chunks in one preallocated buffer.
+
+        def patched_all_to_all_single(output,
+                                      input_,
+                                      output_split_sizes=None,
+                                      input_split_sizes=None,
+                                      group=None,
+                                      async_op=False):
+            output.copy_(torch.tensor([[10, 20], [50, 60]]))
+
+        torch.distributed.all_to_all_single = patched_all_to_all_single
+
         input_ = torch.tensor([[10, 20], [30, 40]])
 
         with patch.dict(dist.distributed_c10d._world.pg_map, {dist.group.WORLD: MagicMock()}, clear=False):
@@ -90,3 +135,43 @@ class TestNPUCommunicator(unittest.TestCase):
             output = comm.all_to_all(input_, scatter_dim=0, gather_dim=0)
 
         assert output.tolist() == [[10, 20], [50, 60]]
+
+    @patch("vllm.config.get_current_vllm_config", return_value=None)
+    @patch("torch.npu.current_device", return_value=MagicMock())
+    @patch("torch.npu.set_device", return_value=MagicMock())
+    @patch("torch.distributed.get_process_group_ranks",
+           return_value={
+               0: 0,
+               1: 1
+           })
+    @patch("torch.distributed.get_group_rank", return_value={0: 0, 1: 1})
+    @patch("torch.distributed.is_initialized", return_value=True)
+    @patch("torch.distributed.get_rank", return_value=1)
+    @patch("torch.distributed.is_initialized", return_value=True)
+    @patch("torch.distributed.get_backend", return_value="hccl")
+    @patch("torch.distributed.get_rank", return_value=1)
+    @patch("torch.distributed.get_world_size", return_value=2)
+    @patch("torch.distributed.get_process_group_ranks", return_value=[0, 1])
+    @patch("torch.npu.device")
+    def test_all_to_all_single_gather_last_dim(self, *_):
+        # The fast path stacks received chunks along dim 0; for a non-zero
+        # gather dim they must be merged back into the cat-based layout.
+
+        def patched_all_to_all_single(output,
+                                      input_,
+                                      output_split_sizes=None,
+                                      input_split_sizes=None,
+                                      group=None,
+                                      async_op=False):
+            output.copy_(torch.tensor([[10, 20], [50, 60]]))
+
+        torch.distributed.all_to_all_single = patched_all_to_all_single
+
+        input_ = torch.tensor([[10, 20], [30, 40]])
+
+        with patch.dict(dist.distributed_c10d._world.pg_map, {dist.group.WORLD: MagicMock()}, clear=False):
+            comm = NPUCommunicator(cpu_group=dist.group.WORLD)
+            output = comm.all_to_all(input_, scatter_dim=0, gather_dim=-1)
+
+        # Chunks [[10, 20]] and [[50, 60]] concatenated along the last dim.
+        assert output.tolist() == [[10, 20, 50, 60]]
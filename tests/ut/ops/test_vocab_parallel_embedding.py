@@ -87,6 +87,9 @@ class TestCustomVocabParallelEmbedding(unittest.TestCase):
             layer.shard_indices.num_org_vocab_padding = 5
             layer.shard_indices.added_vocab_start_index = 30
             layer.shard_indices.added_vocab_end_index = 40
+            # Keep the cached mask args in sync with the mocked shard indices.
+            layer._mask_args = (10, 20, 5, 30, 40)
+            layer._needs_masking = True
 
             # Mock the quantization method
             layer.quant_method.embedding = MagicMock(
@@ -185,6 +188,54 @@ class TestCustomVocabParallelEmbedding(unittest.TestCase):
         self.assertTrue(torch.all(output[3] == mock_output[3]))
         self.assertEqual(output.shape, (5, self.embedding_dim))
 
+    def test_forward_skips_masking_for_full_vocab_shard(self):
+        """A shard covering the whole vocabulary needs neither the mask
+        build nor the output zeroing, even with tp_size > 1."""
+        layer = self._create_layer()
+        layer.tp_size = 2
+        layer._needs_masking = False
+        layer._get_masked_input_and_mask = MagicMock()
+
+        mock_output = torch.randn(2, self.embedding_dim)
+        layer.quant_method.embedding = MagicMock(
+            return_value=mock_output.clone())
+
+        input_ = torch.tensor([15, 35])
+
+        with patch("torch.ops.vllm.maybe_pad_and_reduce",
+                   side_effect=lambda x: x):
+            output = layer.forward(input_)
+
+        # The ids go straight to the lookup and the embeddings come back
+        # untouched: no mask build, no zero-fill.
+        layer._get_masked_input_and_mask.assert_not_called()
+        layer.quant_method.embedding.assert_called_once_with(
+            layer, input_.long())
+        self.assertTrue(torch.equal(output, mock_output))
+
+    def test_forward_embed_tp_narrows_ids_to_int32(self):
+        """Embed TP sends token ids over the wire as int32 and casts back
+        to long only for the embedding lookup."""
+        layer = self._create_layer()
+        layer.forward_type = "embed_tp"
+        mock_comm_group = MagicMock()
+        mock_comm_group.all_gather.side_effect = lambda x, dim=0: x
+        mock_comm_group.reduce_scatter.side_effect = lambda x, dim=0: x
+        layer.comm_group = mock_comm_group
+
+        input_ = torch.tensor([15, 35])  # int64 token ids
+
+        output = layer.forward(input_)
+
+        # The gather moves the narrowed ids, not the original int64 ones.
+        gathered = mock_comm_group.all_gather.call_args[0][0]
+        self.assertEqual(gathered.dtype, torch.int32)
+        # The lookup itself still receives long indices.
+        looked_up = layer.quant_method.embedding.call_args[0][1]
+        self.assertEqual(looked_up.dtype, torch.int64)
+        mock_comm_group.reduce_scatter.assert_called_once()
+        self.assertEqual(output.shape, (2, self.embedding_dim))
+
     def test_output_shape(self):
         """Test that output shape is correct."""
         # Create a fresh embedding layer
@@ -267,3 +318,62 @@ class TestAscendLogitsProcessor(unittest.TestCase):
         hidden_state = torch.randn(1, self.org_num_embeddings)
         processor._get_logits(hidden_state, lmhead)
         self.mock_quant_method.apply.assert_called_once()
+
+    def test_get_logits_lmheadtp_multi_rank_numeric(self):
+        """Each rank must end up with the full-vocab logits of its own
+        tokens, i.e. the same rows a single-rank full matmul would give."""
+        world_size = 2
+        local_batch = 2
+        hidden_dim = 4
+        torch.manual_seed(0)
+        all_hidden = [
+            torch.randn(local_batch, hidden_dim) for _ in range(world_size)
+        ]
+        full_weight = torch.randn(self.vocab_size, hidden_dim)
+        weight_shards = torch.chunk(full_weight, world_size, dim=0)
+        gathered_hidden = torch.cat(all_hidden, dim=0)
+        # What every rank computes after the batch gather: all tokens against
+        # its local vocab shard.
+        all_local_logits = [
+            gathered_hidden @ shard.t() for shard in weight_shards
+        ]
+
+        for rank in range(world_size):
+            group = MagicMock()
+            group.world_size = world_size
+            group.rank_in_group = rank
+
+            def mock_all_gather(tensor, dim=0, _rank=rank):
+                # Only the batch-dim gather of hidden states is expected.
+                self.assertEqual(dim, 0)
+                self.assertTrue(torch.equal(tensor, all_hidden[_rank]))
+                return gathered_hidden
+
+            def mock_all_to_all(tensor, _rank=rank):
+                # all_to_all(scatter batch, gather vocab): rank r receives
+                # its own batch rows of every rank's vocab shard.
+                self.assertTrue(torch.equal(tensor, all_local_logits[_rank]))
+                start = _rank * local_batch
+                return torch.cat([
+                    logits[start:start + local_batch]
+                    for logits in all_local_logits
+                ],
+                                 dim=-1)
+
+            group.all_gather.side_effect = mock_all_gather
+            group.all_to_all.side_effect = mock_all_to_all
+
+            processor = AscendLogitsProcessor(vocab_size=self.vocab_size)
+            lmhead = MagicMock()
+            lmhead.quant_method.apply.side_effect = \
+                lambda lm_head, x, bias=None, _shard=weight_shards[rank]: \
+                x @ _shard.t()
+
+            with patch(
+                    "vllm_ascend.ops.vocab_parallel_embedding.get_lmhead_tp_group",
+                    return_value=group):
+                logits = processor._get_logits_lmheadtp(
+                    all_hidden[rank], lmhead, None)
+
+            expected = all_hidden[rank] @ full_weight.t()
+            self.assertTrue(torch.allclose(logits, expected))
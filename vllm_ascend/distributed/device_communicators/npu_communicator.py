@@ -46,10 +46,28 @@ class NPUCommunicator(DeviceCommunicatorBase):
         if gather_dim < 0:
             gather_dim += input_.dim()
 
+        if (
+            scatter_sizes is None
+            and gather_sizes is None
+            and scatter_dim == 0
+            and input_.size(0) % self.world_size == 0
+        ):
+            return self._all_to_all_single(input_, gather_dim)
+
         if scatter_sizes is not None and gather_sizes is not None:
             input_list = [t.contiguous() for t in torch.split(input_, scatter_sizes, scatter_dim)]
-            output_list = []
             tensor_shape_base = input_list[self.rank].size()
+            if gather_dim == 0:
+                # Dim-0 splits of one preallocated tensor are contiguous
+                # views, so the collective can write into them directly and
+                # the torch.cat pass below is unnecessary.
+                tensor_shape = list(tensor_shape_base)
+                tensor_shape[0] = sum(gather_sizes)
+                output_tensor = torch.empty(tensor_shape, dtype=input_.dtype, device=input_.device)
+                output_list = list(torch.split(output_tensor, gather_sizes, 0))
+                dist.all_to_all(output_list, input_list, group=self.device_group)
+                return output_tensor
+            output_list = []
             for i in range(self.world_size):
                 tensor_shape = list(tensor_shape_base)
                 tensor_shape[gather_dim] = gather_sizes[i]
@@ -60,5 +78,20 @@ class NPUCommunicator(DeviceCommunicatorBase):
             output_list = [torch.empty_like(input_list[i]) for i in range(self.world_size)]
 
         dist.all_to_all(output_list, input_list, group=self.device_group)
-        output_tensor = torch.cat(output_list, dim=gather_dim).contiguous()
-        return output_tensor
+        # torch.cat already materializes the final contiguous layout in one
+        # pass; no extra .contiguous() copy is needed on top of it.
+        return torch.cat(output_list, dim=gather_dim)
+
+    def _all_to_all_single(self, input_: torch.Tensor, gather_dim: int) -> torch.Tensor:
+        # Equal-split fast path: one HCCL call into a single preallocated
+        # buffer instead of per-rank buffers plus a torch.cat pass.
+        input_ = input_.contiguous()
+        output = torch.empty_like(input_)
+        dist.all_to_all_single(output, input_, group=self.device_group)
+        if gather_dim == 0:
+            return output
+        # The received chunks are stacked along dim 0; merge them into
+        # gather_dim to match the cat-based layout of the general path.
+        chunk_size = input_.size(0) // self.world_size
+        output = output.view(self.world_size, chunk_size, *input_.shape[1:])
+        return output.movedim(0, gather_dim).flatten(gather_dim, gather_dim + 1)
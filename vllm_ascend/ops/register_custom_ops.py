@@ -53,14 +53,15 @@ def _maybe_all_gather_and_maybe_unpad_impl(x: torch.Tensor, label: bool, is_ep_c
                 x = x[:-pad_size]
         else:
             x = get_ep_group().all_gather(x, 0)
-            # unpad
-            num_tokens_across_dp_cpu = dp_metadata.num_tokens_across_dp_cpu
-            result = torch.empty((num_tokens_across_dp_cpu.sum(), *x.shape[1:]), device=x.device, dtype=x.dtype)
+            # unpad; convert the CPU token counts to Python ints once instead
+            # of indexing out a 0-dim tensor per rank in the copy loop.
+            num_tokens_across_dp = dp_metadata.num_tokens_across_dp_cpu.tolist()
+            result = torch.empty((sum(num_tokens_across_dp), *x.shape[1:]), device=x.device, dtype=x.dtype)
             dp_size = get_dp_group().world_size
             x = x.view(dp_size, _EXTRA_CTX.padded_length, *x.shape[1:])
             offset = 0
             for idx in range(dp_size):
-                num_tokens_dp = num_tokens_across_dp_cpu[idx]
+                num_tokens_dp = num_tokens_across_dp[idx]
                 result[offset : offset + num_tokens_dp] = x[idx, :num_tokens_dp]
                 offset += num_tokens_dp
             x = result
@@ -86,11 +87,11 @@ def _maybe_pad_and_reduce_impl(x: torch.Tensor, is_ep_comm: bool = False) -> tor
     else:
         # padding
         dp_size = get_dp_group().world_size
-        num_tokens_across_dp_cpu = get_forward_context().dp_metadata.num_tokens_across_dp_cpu
+        num_tokens_across_dp = get_forward_context().dp_metadata.num_tokens_across_dp_cpu.tolist()
         padded_x = torch.empty((dp_size, _EXTRA_CTX.padded_length, *x.shape[1:]), device=x.device, dtype=x.dtype)
         offset = 0
         for idx in range(dp_size):
-            num_tokens_dp = num_tokens_across_dp_cpu[idx]
+            num_tokens_dp = num_tokens_across_dp[idx]
             padded_x[idx, :num_tokens_dp] = x[offset : offset + num_tokens_dp]
             offset += num_tokens_dp
 
@@ -37,7 +37,17 @@ from vllm.model_executor.layers.vocab_parallel_embedding import (
 from vllm.model_executor.utils import set_weight_attrs
 
 from vllm_ascend.distributed.parallel_state import get_embed_tp_group, get_lmhead_tp_group
-from vllm_ascend.utils import embedding_tp_enable, lmhead_tp_enable
+from vllm_ascend.utils import embedding_tp_enable, enable_custom_op, lmhead_tp_enable
+
+# Largest padded vocabulary whose token ids are still exactly representable
+# in int32, allowing the ids to be moved across collectives at half width.
+_MAX_INT32_VOCAB_SIZE = torch.iinfo(torch.int32).max
+
+
+def _as_long(input_: torch.Tensor) -> torch.Tensor:
+    # Token ids are usually int64 already; skip the no-op dispatch that
+    # .long() would still pay in that case.
+    return input_ if input_.dtype == torch.int64 else input_.long()
 
 
 class AscendVocabParallelEmbedding(VocabParallelEmbedding):
@@ -59,9 +69,11 @@ class AscendVocabParallelEmbedding(VocabParallelEmbedding):
     ):
         nn.Module.__init__(self)
         self.forward_type = None
-        if lmhead_tp_enable() and "head" in prefix:
+        # Test the cheap substring membership first so the config-derived
+        # enable lookups only run for the layers they can apply to.
+        if "head" in prefix and lmhead_tp_enable():
             self.comm_group = get_lmhead_tp_group()
-        elif embedding_tp_enable() and "embed_tokens" in prefix:
+        elif "embed_tokens" in prefix and embedding_tp_enable():
             self.comm_group = get_embed_tp_group()
             self.forward_type = "embed_tp"
         else:
@@ -121,6 +133,23 @@ class AscendVocabParallelEmbedding(VocabParallelEmbedding):
         self.num_added_embeddings_per_partition = (
             self.shard_indices.added_vocab_end_index - self.shard_indices.added_vocab_start_index
         )
+        # The mask arguments are constant for a given shard; cache them as
+        # plain ints so the forward paths skip the attribute-chain lookups.
+        self._mask_args = (
+            int(self.shard_indices.org_vocab_start_index),
+            int(self.shard_indices.org_vocab_end_index),
+            int(self.shard_indices.num_org_vocab_padding),
+            int(self.shard_indices.added_vocab_start_index),
+            int(self.shard_indices.added_vocab_end_index),
+        )
+        # When this shard covers the whole original vocabulary and there is no
+        # added vocab, every token id is already a valid local index, so the
+        # mask build and the zero-fill of the output can be skipped entirely.
+        self._needs_masking = not (
+            self.shard_indices.org_vocab_start_index == 0
+            and self.shard_indices.org_vocab_end_index == self.org_vocab_size
+            and self.shard_indices.added_vocab_start_index == self.shard_indices.added_vocab_end_index
+        )
 
         self.quant_method.create_weights(
             self,
@@ -141,23 +170,37 @@ class AscendVocabParallelEmbedding(VocabParallelEmbedding):
         added_vocab_start_index: int,
         added_vocab_end_index: int,
     ) -> tuple[torch.Tensor, torch.Tensor]:
-        # torch.compile will fuse all of the pointwise ops below
-        # into a single kernel, making it very fast
-        org_vocab_mask = (input_ >= org_vocab_start_index) & (input_ < org_vocab_end_index)
+        if enable_custom_op() and (
+            input_.dtype == torch.int32
+            or (input_.dtype == torch.int64 and self.num_embeddings_padded <= _MAX_INT32_VOCAB_SIZE)
+        ):
+            # The fused AscendC kernel computes the masked input and mask in a
+            # single pass; it only accepts int32, so int64 ids are narrowed
+            # only when the padded vocab fits the int32 range (same guard as
+            # the embed-TP wire narrowing). Callers cast back to long at the
+            # embedding lookup.
+            return torch.ops._C_ascend.get_masked_input_and_mask(
+                input_ if input_.dtype == torch.int32 else input_.to(torch.int32),
+                org_vocab_start_index,
+                org_vocab_end_index,
+                num_org_vocab_padding,
+                added_vocab_start_index,
+                added_vocab_end_index,
+            )
+        # Eager fallback: subtract the range start once so the in-range test
+        # runs on the shifted value and the remap becomes a single select,
+        # instead of building per-range offset tensors and multiplying them in.
+        org_shifted = input_ - org_vocab_start_index
+        org_vocab_mask = (org_shifted >= 0) & (org_shifted < org_vocab_end_index - org_vocab_start_index)
         # Adapt: avoid create added_vocab_mask when added_vocab_start_index == added_vocab_end_index.
         if added_vocab_start_index == added_vocab_end_index:
-            valid_offset = org_vocab_start_index * org_vocab_mask
-            vocab_mask = org_vocab_mask
-        else:
-            added_vocab_mask = (input_ >= added_vocab_start_index) & (input_ < added_vocab_end_index)
-            added_offset = (
-                added_vocab_start_index - (org_vocab_end_index - org_vocab_start_index) - num_org_vocab_padding
-            )
-            valid_offset = (org_vocab_start_index * org_vocab_mask) + (added_offset * added_vocab_mask)
-            vocab_mask = org_vocab_mask | added_vocab_mask
+            return torch.where(org_vocab_mask, org_shifted, 0), ~org_vocab_mask
+        added_vocab_mask = (input_ >= added_vocab_start_index) & (input_ < added_vocab_end_index)
+        added_offset = added_vocab_start_index - (org_vocab_end_index - org_vocab_start_index) - num_org_vocab_padding
+        vocab_mask = org_vocab_mask | added_vocab_mask
         # Adapt end.
-        input_ = vocab_mask * (input_ - valid_offset)
-        return input_, ~vocab_mask
+        masked_input = torch.where(org_vocab_mask, org_shifted, input_ - added_offset) * vocab_mask
+        return masked_input, ~vocab_mask
 
     def forward(self, input_):
         if self.forward_type == "embed_tp":
@@ -166,40 +209,42 @@ class AscendVocabParallelEmbedding(VocabParallelEmbedding):
             return self._forward_origin(input_)
 
     def _forward_embed_tp(self, input_):
-        complete_input = self.comm_group.all_gather(input_, dim=0)
-        masked_input, input_mask = self._get_masked_input_and_mask(
-            complete_input,
-            self.shard_indices.org_vocab_start_index,
-            self.shard_indices.org_vocab_end_index,
-            self.shard_indices.num_org_vocab_padding,
-            self.shard_indices.added_vocab_start_index,
-            self.shard_indices.added_vocab_end_index,
-        )
+        comm_group = self.comm_group
+        # Read the local batch size before the collective is enqueued; the
+        # host-side bookkeeping then runs while the gather is in flight
+        # instead of touching input_ again afterwards.
+        local_batch_size = input_.shape[0]
+        # Token ids fit in int32 for any realistic vocabulary; narrowing
+        # before the gather halves the bytes moved across the embed TP group.
+        # The lookup below casts back to long via _as_long.
+        if input_.dtype == torch.int64 and self.num_embeddings_padded <= _MAX_INT32_VOCAB_SIZE:
+            input_ = input_.to(torch.int32)
+        complete_input = comm_group.all_gather(input_, dim=0)
+        masked_input, input_mask = self._get_masked_input_and_mask(complete_input, *self._mask_args)
         # Get the embeddings.
-        output_parallel = self.quant_method.embedding(self, masked_input.long())
-        output_parallel.masked_fill_(input_mask.unsqueeze(-1), 0)
-        output = self.comm_group.reduce_scatter(output_parallel, dim=0)
-        output = output.view(input_.shape[0], -1)
+        output_parallel = self.quant_method.embedding(self, _as_long(masked_input))
+        # Out-of-place select, as in _forward_origin: the in-place
+        # masked_fill_ would block fusion across this point under graph
+        # capture.
+        output_parallel = torch.where(input_mask.unsqueeze(-1), 0, output_parallel)
+        output = comm_group.reduce_scatter(output_parallel, dim=0)
+        output = output.view(local_batch_size, -1)
         return output
 
     def _forward_origin(self, input_):
-        if self.tp_size > 1:
+        needs_masking = self.tp_size > 1 and self._needs_masking
+        if needs_masking:
             # Build the mask.
-            masked_input, input_mask = self._get_masked_input_and_mask(
-                input_,
-                self.shard_indices.org_vocab_start_index,
-                self.shard_indices.org_vocab_end_index,
-                self.shard_indices.num_org_vocab_padding,
-                self.shard_indices.added_vocab_start_index,
-                self.shard_indices.added_vocab_end_index,
-            )
+            masked_input, input_mask = self._get_masked_input_and_mask(input_, *self._mask_args)
         else:
             masked_input = input_
         # Get the embeddings.
-        output_parallel = self.quant_method.embedding(self, masked_input.long())
-        # Mask the output embedding.
-        if self.tp_size > 1:
-            output_parallel.masked_fill_(input_mask.unsqueeze(-1), 0)
+        output_parallel = self.quant_method.embedding(self, _as_long(masked_input))
+        # Mask the output embedding. The out-of-place select lets graph
+        # capture fuse the zeroing with neighboring kernels, whereas the
+        # in-place masked_fill_ acts as a fusion barrier.
+        if needs_masking:
+            output_parallel = torch.where(input_mask.unsqueeze(-1), 0, output_parallel)
         # Reduce across all the model parallel GPUs.
         output = torch.ops.vllm.maybe_pad_and_reduce(output_parallel)
         return output
@@ -261,11 +306,15 @@ class AscendLogitsProcessor(LogitsProcessor):
         lm_head: AscendParallelLMHead,
         embedding_bias: torch.Tensor | None,
     ) -> torch.Tensor | None:
+        lmhead_tp_group = get_lmhead_tp_group()
         # Gather hidden states from all devices in tensor parallel group
-        gathered_hidden_states = get_lmhead_tp_group().all_gather(hidden_states, dim=0)
+        gathered_hidden_states = lmhead_tp_group.all_gather(hidden_states, dim=0)
         local_logits = lm_head.quant_method.apply(lm_head, gathered_hidden_states, bias=embedding_bias)
-        # Gather logits for tensor parallel
-        logits = get_lmhead_tp_group().all_to_all(local_logits)
+        # Gather logits for tensor parallel: rank r needs every rank's vocab
+        # shard of rank r's batch rows. That per-rank-distinct exchange is
+        # exactly all_to_all (scatter batch dim, gather vocab dim); a
+        # symmetric all-gather of each rank's own rows cannot provide it.
+        logits = lmhead_tp_group.all_to_all(local_logits)
         # Remove paddings in vocab (if any)
         if logits is not None:
             logits = logits[..., : self.org_vocab_size]
@@ -41,6 +41,9 @@ class AscendSampler(Sampler):
         super().__init__(logprobs_mode=logprobs_mode)
         self.topk_topp_sampler = AscendTopKTopPSampler()
         self.async_exponential_event = torch.npu.Event()
+        # Cache the device object once: a string spec would be re-parsed on
+        # every per-step allocation and always maps to the default index.
+        self.device = torch.device("npu", torch.npu.current_device())
 
     def set_q_event(self, q, event):
         self.topk_topp_sampler.set_q_event(q, event)
@@ -50,7 +53,7 @@ class AscendSampler(Sampler):
         # and overlapping with model executing.
         with torch.npu.stream(global_stream()):
             global_stream().wait_stream(torch.npu.current_stream())
-            q = torch.empty((b_s, head_dim), device="npu", dtype=torch.float32)
+            q = torch.empty((b_s, head_dim), device=self.device, dtype=torch.float32)
             # Goes to async exponential with AI-CPU exponential or default exponential.
             if len(generators) != q.shape[0]:
                 q.exponential_()